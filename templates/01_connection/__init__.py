@@ -1,4 +1,4 @@
 """
 Connection templates for MetaTrader 5.
 """
-from .basic_connect import connect_mt5, disconnect_mt5
+from .basic_connect import connect_mt5, disconnect_mt5, setup_logging
@@ -1,11 +1,107 @@
+import logging
+import logging.handlers
+import queue
+import threading
+from typing import List, Optional
+
 import MetaTrader5 as mt5
 
+log = logging.getLogger("mt5.connection")
+
+KEEPALIVE_INTERVAL = 20.0
+
+_keepalive_stop: Optional[threading.Event] = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record):
+        # The stock handler formats here, on the caller's thread. Records
+        # stay in-process, so hand them over untouched.
+        return record
+
+
+class _RateLimitFilter(logging.Filter):
+    """Drop repeats of an identical record within ``interval`` seconds."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__()
+        self.interval = interval
+        self._last_seen = {}
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, record.msg, record.args)
+        now = record.created
+        with self._lock:
+            try:
+                last = self._last_seen.get(key)
+            except TypeError:  # unhashable args: never suppress
+                return True
+            if last is not None and now - last < self.interval:
+                return False
+            self._last_seen[key] = now
+            if now >= self._next_prune:
+                # Records with unique args (prices, tickets) would otherwise
+                # accumulate forever; expired entries cannot suppress anything
+                cutoff = now - self.interval
+                self._last_seen = {k: t for k, t in self._last_seen.items() if t > cutoff}
+                self._next_prune = now + self.interval
+        return True
+
+
+def setup_logging(
+    level: int = logging.INFO,
+    min_interval: float = 1.0
+) -> logging.handlers.QueueListener:
+    """
+    Route all ``mt5.*`` loggers through a queue to a background thread.
+    
+    The calling (trading) thread only enqueues the record; formatting and
+    the blocking stream write happen in the listener thread. ``mt5`` records
+    do not propagate to the root logger, so a ``basicConfig`` elsewhere does
+    not reintroduce synchronous writes. Calling this again replaces the
+    previous queue handler instead of stacking another one.
+    
+    Args:
+        level: Minimum level for the ``mt5`` logger hierarchy
+        min_interval: Identical records (same logger, level, message and
+            arguments) repeated within this many seconds are dropped, so a
+            failing poll loop cannot flood the queue; 0 disables it
+    
+    Returns:
+        The started QueueListener; call ``stop()`` on shutdown to flush it
+    """
+    records = queue.SimpleQueue()
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+    
+    handler = _DeferredQueueHandler(records)
+    if min_interval > 0:
+        handler.addFilter(_RateLimitFilter(min_interval))
+    
+    logger = logging.getLogger("mt5")
+    for existing in [h for h in logger.handlers if isinstance(h, _DeferredQueueHandler)]:
+        logger.removeHandler(existing)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(records, stream)
+    listener.start()
+    return listener
+
+
 def connect_mt5(
     path: str = None,
     login: int = None,
     password: str = None,
     server: str = None,
-    timeout: int = 60000
+    timeout: int = 60000,
+    warmup_symbols: Optional[List[str]] = None,
+    keepalive: bool = False
 ) -> bool:
     """
     Connect to MT5 terminal with comprehensive error handling.
@@ -16,6 +112,13 @@ def connect_mt5(
         password: Account password
         server: Broker server name
         timeout: Connection timeout in ms
+        warmup_symbols: Symbols to select and pre-fetch so the first
+            trade does not pay for cold symbol/tick lookups
+        keepalive: Touch the terminal every ``KEEPALIVE_INTERVAL`` seconds
+            from a daemon thread until :func:`disconnect_mt5`. Off by
+            default: the thread calls MT5 outside any other serialization,
+            so only enable it when nothing else (e.g. SMACrossoverBot's
+            own keep-alive) is already pinging the terminal
     
     Returns:
         True if connected successfully
@@ -32,30 +135,67 @@ def connect_mt5(
     # Initialize MT5
     if not mt5.initialize(**kwargs):
         error = mt5.last_error()
-        print(f"MT5 initialization failed: {error}")
+        log.error("MT5 initialization failed: %s", error)
         return False
     
     # Verify connection
     account_info = mt5.account_info()
     if account_info is None:
-        print("Failed to get account info")
+        log.error("Failed to get account info")
         mt5.shutdown()
         return False
     
-    print(f"Connected to {account_info.server}")
-    print(f"Account: {account_info.login}")
-    print(f"Balance: ${account_info.balance:,.2f}")
-    print(f"Leverage: 1:{account_info.leverage}")
+    log.info(
+        "Connected to %s account=%s balance=%.2f leverage=1:%s",
+        account_info.server,
+        account_info.login,
+        account_info.balance,
+        account_info.leverage,
+    )
+    
+    for symbol in warmup_symbols or ():
+        if not mt5.symbol_select(symbol, True):
+            log.warning("Warm-up failed to select %s", symbol)
+            continue
+        mt5.symbol_info(symbol)
+        mt5.symbol_info_tick(symbol)
+    
+    if keepalive:
+        _start_keepalive()
     
     return True
 
+def _start_keepalive() -> None:
+    global _keepalive_stop
+    _stop_keepalive()
+    
+    stop = threading.Event()
+    
+    def ping() -> None:
+        while not stop.wait(KEEPALIVE_INTERVAL):
+            mt5.terminal_info()
+    
+    threading.Thread(target=ping, name="mt5-keepalive", daemon=True).start()
+    _keepalive_stop = stop
+
+def _stop_keepalive() -> None:
+    global _keepalive_stop
+    if _keepalive_stop is not None:
+        _keepalive_stop.set()
+        _keepalive_stop = None
+
 def disconnect_mt5():
     """Safely disconnect from MT5."""
+    _stop_keepalive()
     mt5.shutdown()
-    print("Disconnected from MT5")
+    log.info("Disconnected from MT5")
 
 # Usage
 if __name__ == "__main__":
-    if connect_mt5():
-        # Your trading logic here
-        disconnect_mt5()
+    listener = setup_logging()
+    try:
+        if connect_mt5(warmup_symbols=["EURUSD"]):
+            # Your trading logic here
+            disconnect_mt5()
+    finally:
+        listener.stop()
@@ -1,5 +1,21 @@
 # Data retrieval templates for MT5
-from .get_ohlcv import get_ohlcv, get_latest_tick
+from .get_ohlcv import (
+    TickFeed,
+    get_ohlcv,
+    get_ohlcv_raw,
+    get_ohlcv_many,
+    get_latest_tick,
+    start_tick_feed,
+    stop_tick_feed,
+)
 
 __version__ = "1.0.0"
-__all__ = ["get_ohlcv", "get_latest_tick"]
+__all__ = [
+    "TickFeed",
+    "get_ohlcv",
+    "get_ohlcv_raw",
+    "get_ohlcv_many",
+    "get_latest_tick",
+    "start_tick_feed",
+    "stop_tick_feed",
+]
@@ -4,11 +4,33 @@ Data Retrieval Template for MetaTrader 5
 Retrieves OHLCV history and real-time tick data.
 """
 
+import asyncio
+import logging
+import os
+import tempfile
+import threading
+import time
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from typing import Optional, TypedDict
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, TypedDict
 
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pyarrow is optional; the on-disk bar cache is skipped without it.
+    pa = None
+
+log = logging.getLogger("mt5.data")
+
+# Default pause between TickFeed sweeps, in seconds
+TICK_FEED_INTERVAL = 0.05
+
+# Closed bars never change, so they are kept on disk per (symbol, timeframe)
+CACHE_DIR = Path.home() / ".mt5cache"
 
 class LatestTick(TypedDict):
     """Structured return type for :func:`get_latest_tick`.
@@ -23,24 +45,124 @@ class LatestTick(TypedDict):
     volume: float
     flags: int
 
-def get_ohlcv(
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'tick_volume']
+
+
+def _cache_path(symbol: str, timeframe: int) -> Path:
+    return CACHE_DIR / f"{symbol}_{timeframe}.feather"
+
+# Schema metadata flag: the cache already holds all history MT5 has
+_COMPLETE_KEY = b"mt5cache.complete"
+
+def _read_cache(path: Path) -> Tuple[Optional[np.ndarray], bool]:
+    """Load cached bars into an MT5-style structured array, plus the complete flag."""
+    if not path.exists():
+        return None, False
+    
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowException) as exc:
+        # Truncated or foreign file: rebuild it from MT5
+        log.warning("Ignoring unreadable cache %s: %s", path, exc)
+        return None, False
+    dtype = [(field.name, field.type.to_pandas_dtype()) for field in table.schema]
+    rates = np.empty(table.num_rows, dtype=dtype)
+    for name in table.column_names:
+        rates[name] = table.column(name).to_numpy()
+    complete = (table.schema.metadata or {}).get(_COMPLETE_KEY) == b"1"
+    return rates, complete
+
+def _write_cache(path: Path, rates: np.ndarray, complete: bool) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.table({name: rates[name] for name in rates.dtype.names})
+    if complete:
+        table = table.replace_schema_metadata({_COMPLETE_KEY: b"1"})
+    
+    # Write beside the target and swap it in, so a crash or a second process
+    # never sees a half-written file
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(table, tmp_name)
+        os.replace(tmp_name, path)
+    except (OSError, pa.ArrowException) as exc:
+        log.warning("Failed to write cache %s: %s", path, exc)
+        Path(tmp_name).unlink(missing_ok=True)
+
+def _merge_bars(cached: np.ndarray, fresh: np.ndarray) -> np.ndarray:
+    """Append ``fresh`` to ``cached``, letting fresh bars replace overlapping ones."""
+    older = cached[cached['time'] < fresh['time'][0]]
+    return np.concatenate([older.astype(fresh.dtype), fresh])
+
+def _get_ohlcv_cached(symbol: str, timeframe: int, bars: int) -> Optional[np.ndarray]:
+    """Serve the latest ``bars`` bars, asking MT5 only for bars missing from disk."""
+    path = _cache_path(symbol, timeframe)
+    cached, complete = _read_cache(path)
+    
+    if cached is None or (len(cached) < bars and not complete):
+        fresh = mt5.copy_rates_from(symbol, timeframe, datetime.now(), bars)
+        if fresh is None or len(fresh) == 0:
+            error_code = mt5.last_error()
+            log.warning("Failed to get rates for %s. Error: %s", symbol, error_code)
+            return None
+        
+        # Fewer bars than asked for means MT5 has no older history; remember
+        # that so short symbols stop triggering full refetches.
+        complete = len(fresh) < bars
+        if cached is None or len(cached) == 0 or cached['time'][-1] < fresh['time'][0]:
+            # No overlap: joining would leave a hole, so start over from fresh
+            rates = fresh
+        else:
+            rates = _merge_bars(cached, fresh)
+        _write_cache(path, rates, complete)
+        return rates[-bars:]
+    
+    # The newest cached bar may have been the still-forming one, so the
+    # delta starts at it and overwrites it.
+    last_time = datetime.fromtimestamp(int(cached['time'][-1]), tz=timezone.utc)
+    # Pad the end: server time is usually ahead of UTC
+    end_time = datetime.now(tz=timezone.utc) + timedelta(days=1)
+    fresh = mt5.copy_rates_range(symbol, timeframe, last_time, end_time)
+    if fresh is None or len(fresh) == 0:
+        error_code = mt5.last_error()
+        log.warning("Failed to update rates for %s, serving cached bars. Error: %s", symbol, error_code)
+        return cached[-bars:]
+    
+    rates = _merge_bars(cached, fresh)
+    # Only the forming bar changed: it is refetched next time anyway, so
+    # skip rewriting the file until a new bar has opened.
+    if len(rates) > len(cached):
+        _write_cache(path, rates, complete)
+    return rates[-bars:]
+
+def get_ohlcv_raw(
     symbol: str,
     timeframe: int = mt5.TIMEFRAME_H1,
     bars: int = 1000,
-    start_time: Optional[datetime] = None
-) -> pd.DataFrame:
+    start_time: Optional[datetime] = None,
+    use_cache: bool = False
+) -> Optional[np.ndarray]:
     """
-    Get OHLCV data as a pandas DataFrame.
+    Get OHLCV data as the structured array returned by MT5.
+    
+    Cheapest option for numeric work (RSI, SMA, ...): fields are addressable
+    directly, e.g. ``rates['close']``, without building a DataFrame.
     
     Args:
         symbol: Trading symbol (e.g., "EURUSD")
         timeframe: MT5 timeframe constant (default: H1)
         bars: Number of bars to retrieve
         start_time: Start from specific time (default: now)
+        use_cache: Keep bars in ``CACHE_DIR`` and only request newer ones
+            from MT5 (requires pyarrow; ignored when start_time is given)
     
     Returns:
-        DataFrame with columns: time (index), open, high, low, close, tick_volume
+        Structured array with fields time (epoch seconds), open, high, low,
+        close, tick_volume, spread, real_volume, or None if failed
     """
+    if use_cache and start_time is None and pa is not None:
+        return _get_ohlcv_cached(symbol, timeframe, bars)
+    
     if start_time is None:
         start_time = datetime.now()
     
@@ -49,51 +171,310 @@ def get_ohlcv(
     
     if rates is None or len(rates) == 0:
         error_code = mt5.last_error()
-        print(f"Failed to get rates for {symbol}. Error: {error_code}")
+        log.warning("Failed to get rates for %s. Error: %s", symbol, error_code)
+        return None
+    
+    return rates
+
+def get_ohlcv(
+    symbol: str,
+    timeframe: int = mt5.TIMEFRAME_H1,
+    bars: int = 1000,
+    start_time: Optional[datetime] = None,
+    use_cache: bool = False
+) -> pd.DataFrame:
+    """
+    Get OHLCV data as a pandas DataFrame.
+    
+    Args:
+        symbol: Trading symbol (e.g., "EURUSD")
+        timeframe: MT5 timeframe constant (default: H1)
+        bars: Number of bars to retrieve
+        start_time: Start from specific time (default: now)
+        use_cache: Use the on-disk bar cache (see :func:`get_ohlcv_raw`)
+    
+    Returns:
+        DataFrame with columns: time (index), open, high, low, close, tick_volume
+    """
+    rates = get_ohlcv_raw(symbol, timeframe, bars, start_time, use_cache)
+    if rates is None:
         return pd.DataFrame()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(rates)
+    # Vectorized epoch -> datetime cast, no per-row Timestamp boxing
+    index = pd.DatetimeIndex(rates['time'].astype('datetime64[s]'), name='time')
+    return pd.DataFrame({col: rates[col] for col in OHLCV_COLUMNS}, index=index)
+
+def get_ohlcv_many(
+    symbols: List[str],
+    timeframe: int = mt5.TIMEFRAME_H1,
+    bars: int = 1000,
+    max_workers: int = 1,
+    use_cache: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    Get raw OHLCV arrays for several symbols in one call.
+    
+    Requests are serialized by default: the MT5 Python API is not safe to
+    call concurrently, for reads as much as for orders. Raise
+    ``max_workers`` only if you have verified your terminal tolerates it.
     
-    # Convert timestamp to datetime
-    df['time'] = pd.to_datetime(df['time'], unit='s')
+    Args:
+        symbols: Trading symbols
+        timeframe: MT5 timeframe constant (default: H1)
+        bars: Number of bars to retrieve per symbol
+        max_workers: Maximum concurrent MT5 requests (default 1, serialized)
+        use_cache: Use the on-disk bar cache (see :func:`get_ohlcv_raw`)
+    
+    Returns:
+        Dictionary of symbol -> structured array (see :func:`get_ohlcv_raw`)
+        in input order; symbols that failed are omitted
+    """
+    # Share one end time so every symbol covers the same window
+    start_time = None if use_cache else datetime.now()
+    
+    unique_symbols = list(dict.fromkeys(symbols))
+    fetched: Dict[str, Optional[np.ndarray]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(get_ohlcv_raw, symbol, timeframe, bars, start_time, use_cache): symbol
+            for symbol in unique_symbols
+        }
+        for future in as_completed(futures):
+            fetched[futures[future]] = future.result()
+    
+    # as_completed yields in finish order; restore input order
+    return {symbol: fetched[symbol] for symbol in unique_symbols if fetched[symbol] is not None}
+
+class TickFeed:
+    """
+    Background poller that keeps the latest tick of each symbol in memory.
+    
+    One daemon thread polls ``mt5.symbol_info_tick`` and publishes changed
+    ticks into a ``(n_symbols, 5)`` array (time, bid, ask, volume, flags).
+    Each row is guarded by a seqlock-style version counter (odd while being
+    written), so :meth:`read` never takes a lock and never touches MT5.
+    
+    The MT5 Python API is not safe to call concurrently. Pass the
+    single-thread executor the rest of the application uses for MT5 calls
+    as ``executor`` and every sweep runs on it. Without one the feed calls
+    MT5 from its own thread, alongside any other caller, and serialization
+    is given up.
+    """
+    
+    def __init__(
+        self,
+        symbols: List[str],
+        interval: float = TICK_FEED_INTERVAL,
+        executor: Optional[Executor] = None
+    ):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.interval = interval
+        self.executor = executor
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self._data = np.zeros((len(self.symbols), 5), dtype=np.float64)
+        self._versions = [0] * len(self.symbols)
+        self._last_msc = [0] * len(self.symbols)
+        self._queues: List[tuple] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> bool:
+        """Select all symbols and start the polling thread."""
+        for symbol in self.symbols:
+            if not mt5.symbol_select(symbol, True):
+                log.warning("Failed to select symbol %s", symbol)
+                return False
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mt5-tick-feed", daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def subscribe(self, maxsize: int = 1000) -> "asyncio.Queue":
+        """
+        Return a queue receiving ``(symbol, tick)`` on every new tick.
+        
+        Must be called from a running event loop; ticks are handed over with
+        ``call_soon_threadsafe``. Once ``maxsize`` ticks are waiting, the
+        oldest one is dropped for each new tick, so a slow consumer falls
+        behind instead of growing the queue without bound.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # Copy-on-write so the polling thread never iterates a list being mutated
+        self._queues = self._queues + [(asyncio.get_running_loop(), queue)]
+        return queue
+    
+    def unsubscribe(self, queue: "asyncio.Queue") -> None:
+        """Stop delivering ticks to a queue returned by :meth:`subscribe`."""
+        self._queues = [entry for entry in self._queues if entry[1] is not queue]
+    
+    def is_alive(self) -> bool:
+        """True while the polling thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def read(self, symbol: str) -> Optional[np.ndarray]:
+        """Return a copy of the latest (time, bid, ask, volume, flags) row, or None."""
+        row = self._rows.get(symbol)
+        if row is None:
+            return None
+        
+        versions = self._versions
+        while True:
+            before = versions[row]
+            if before & 1:
+                # Writer is mid-update; let it finish
+                time.sleep(0)
+                continue
+            values = self._data[row].copy()
+            if versions[row] == before:
+                break
+        
+        return values if before else None
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.executor is None:
+                    self._sweep()
+                else:
+                    self.executor.submit(self._sweep).result()
+            except Exception:
+                # Keep polling; a dead feed would leave readers with frozen prices
+                log.exception("Tick feed sweep failed")
+            
+            self._stop.wait(self.interval)
     
-    # Set time as index
-    df.set_index('time', inplace=True)
+    def _sweep(self) -> None:
+        data = self._data
+        versions = self._versions
+        last_msc = self._last_msc
+        for row, symbol in enumerate(self.symbols):
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None or tick.time_msc == last_msc[row]:
+                continue
+            
+            last_msc[row] = tick.time_msc
+            versions[row] += 1
+            try:
+                data[row] = (tick.time, tick.bid, tick.ask, tick.volume, tick.flags)
+            finally:
+                versions[row] += 1
+            
+            self._publish(symbol, tick)
+    
+    def _publish(self, symbol: str, tick) -> None:
+        closed = []
+        for loop, queue in self._queues:
+            if loop.is_closed():
+                closed.append(queue)
+                continue
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, (symbol, tick))
+            except RuntimeError:
+                # Loop closed between the check and the call
+                closed.append(queue)
+        
+        for queue in closed:
+            log.info("Dropping tick subscriber whose event loop is closed")
+            self.unsubscribe(queue)
     
-    # Return standard columns
-    return df[['open', 'high', 'low', 'close', 'tick_volume']]
+    @staticmethod
+    def _offer(queue: "asyncio.Queue", item: tuple) -> None:
+        # Runs on the subscriber's loop, so the check and the put cannot race
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+_tick_feed: Optional[TickFeed] = None
+
+def start_tick_feed(
+    symbols: List[str],
+    interval: float = TICK_FEED_INTERVAL,
+    executor: Optional[Executor] = None
+) -> Optional[TickFeed]:
+    """
+    Start the shared tick feed used by :func:`get_latest_tick`.
+    
+    Without ``executor`` the feed polls MT5 from its own thread, concurrently
+    with every other MT5 caller; pass your single-thread MT5 executor to keep
+    calls serialized (see :class:`TickFeed`).
+    
+    Args:
+        symbols: Symbols to stream
+        interval: Pause between polling sweeps in seconds
+        executor: Executor that every polling sweep is run on
+    
+    Returns:
+        The running TickFeed, or None if a symbol could not be selected
+    """
+    global _tick_feed
+    stop_tick_feed()
+    
+    feed = TickFeed(symbols, interval, executor)
+    if not feed.start():
+        return None
+    
+    _tick_feed = feed
+    return feed
+
+def stop_tick_feed() -> None:
+    """Stop the shared tick feed, if running."""
+    global _tick_feed
+    if _tick_feed is not None:
+        _tick_feed.stop()
+        _tick_feed = None
+
+def _to_latest_tick(tick_time: float, bid: float, ask: float, volume: float, flags: int) -> LatestTick:
+    return {
+        'time': datetime.fromtimestamp(tick_time),
+        'bid': bid,
+        'ask': ask,
+        'spread': round((ask - bid) * 10000, 1),  # Estimate in pips (for standard pairs)
+        'volume': volume,
+        'flags': flags
+    }
 
 def get_latest_tick(symbol: str) -> Optional[LatestTick]:
     """
     Get the most recent tick for a symbol.
     
+    Served from memory when the symbol is streamed by a running
+    :func:`start_tick_feed`; otherwise the tick is requested from MT5.
+    
     Args:
         symbol: Trading symbol
         
     Returns:
         Dictionary with tick data or None if failed
     """
+    if _tick_feed is not None and _tick_feed.is_alive():
+        row = _tick_feed.read(symbol)
+        if row is not None:
+            tick_time, bid, ask, volume, flags = row.tolist()
+            return _to_latest_tick(tick_time, bid, ask, volume, int(flags))
+    
     if not mt5.symbol_select(symbol, True):
-        print(f"Failed to select symbol {symbol}")
+        log.warning("Failed to select symbol %s", symbol)
         return None
         
     tick = mt5.symbol_info_tick(symbol)
     if tick is None:
-        print(f"Failed to get tick for {symbol}")
+        log.warning("Failed to get tick for %s", symbol)
         return None
     
-    return {
-        'time': datetime.fromtimestamp(tick.time),
-        'bid': tick.bid,
-        'ask': tick.ask,
-        'spread': round((tick.ask - tick.bid) * 10000, 1),  # Estimate in pips (for standard pairs)
-        'volume': tick.volume,
-        'flags': tick.flags
-    }
+    return _to_latest_tick(tick.time, tick.bid, tick.ask, tick.volume, tick.flags)
 
 # Usage Example
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Initialize connection (update path/login if needed, or rely on auto-find)
     if not mt5.initialize():
         print("initialize() failed")
@@ -1 +1,10 @@
-from .trade_executor import market_order, close_position, TradeResult
+from .trade_executor import (
+    market_order,
+    close_position,
+    close_positions_bulk,
+    market_order_async,
+    close_position_async,
+    retcode_name,
+    invalidate,
+    TradeResult,
+)
@@ -4,36 +4,133 @@ Order Management Template for MetaTrader 5
 Handles market orders and closing positions with basic error checking.
 """
 
+import asyncio
+import functools
+import logging
 import MetaTrader5 as mt5
-from dataclasses import dataclass
-from typing import Literal, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Literal, NamedTuple, Optional, Tuple
 
-@dataclass
-class TradeResult:
+log = logging.getLogger("mt5.trade")
+
+# The MT5 API is not safe to call concurrently: the async wrappers below run
+# every request on this single warm worker thread.
+_mt5_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5")
+
+class TradeResult(NamedTuple):
     success: bool
     ticket: int = 0
     price: float = 0.0
     message: str = ""
+    retcode: int = 0  # MT5 trade return code; see retcode_name()
+
+
+# TRADE_RETCODE_* value -> short name, e.g. 10004 -> "requote"
+_MT5_RETCODES = {
+    getattr(mt5, name): name[len("TRADE_RETCODE_"):].lower()
+    for name in dir(mt5)
+    if name.startswith("TRADE_RETCODE_")
+}
+
+
+def retcode_name(retcode: int) -> str:
+    """Return the short name of an MT5 trade return code ("unknown" if not listed)."""
+    return _MT5_RETCODES.get(retcode, "unknown")
+
+
+_ORDER_TYPES = {"BUY": mt5.ORDER_TYPE_BUY, "SELL": mt5.ORDER_TYPE_SELL}
 
 
 def _calculate_sl_tp(
     direction: Literal["BUY", "SELL"],
     price: float,
-    point: float,
+    pip_value: float,
     sl_pips: Optional[float],
     tp_pips: Optional[float],
 ) -> Tuple[float, float]:
     """Calculate SL/TP prices based on order direction."""
-    pip_value = point * 10
+    # BUY: SL below / TP above the price; SELL mirrors it
+    sign = 1.0 if direction == "BUY" else -1.0
+    sl = price - sign * sl_pips * pip_value if sl_pips else 0.0
+    tp = price + sign * tp_pips * pip_value if tp_pips else 0.0
+    return sl, tp
 
-    if direction == "BUY":
-        sl = price - sl_pips * pip_value if sl_pips else 0.0
-        tp = price + tp_pips * pip_value if tp_pips else 0.0
-    else:
-        sl = price + sl_pips * pip_value if sl_pips else 0.0
-        tp = price - tp_pips * pip_value if tp_pips else 0.0
 
-    return sl, tp
+OrderBuilder = Callable[[float, float, Optional[float], Optional[float], str, int], dict]
+
+# (symbol, direction) -> request builder; see _order_builder()
+_order_builders: Dict[Tuple[str, str], OrderBuilder] = {}
+
+
+def invalidate(symbol: Optional[str] = None) -> None:
+    """
+    Drop cached order builders so symbols are resolved and selected again.
+    
+    Call after a reconnect or account switch. Without ``symbol`` every
+    cached builder is purged.
+    """
+    if symbol is None:
+        _order_builders.clear()
+        return
+    
+    for key in [key for key in _order_builders if key[0] == symbol]:
+        del _order_builders[key]
+
+
+def _make_order_builder(symbol: str, direction: Literal["BUY", "SELL"]) -> OrderBuilder:
+    """
+    Build a request factory for one (symbol, direction) pair.
+    
+    The symbol is resolved and selected once; the returned callable only
+    patches volume/price/sl/tp/comment/magic into a prebuilt request.
+    Raises LookupError for unusable symbols.
+    """
+    symbol_info = mt5.symbol_info(symbol)
+    if symbol_info is None:
+        raise LookupError(f"Symbol {symbol} not found")
+    
+    if not symbol_info.visible:
+        if not mt5.symbol_select(symbol, True):
+            raise LookupError(f"Symbol {symbol} not visible and selection failed")
+    
+    pip_value = symbol_info.point * 10
+    template = {
+        "action": mt5.TRADE_ACTION_DEAL,
+        "symbol": symbol,
+        "type": _ORDER_TYPES[direction],
+        "deviation": 20,
+        "type_time": mt5.ORDER_TIME_GTC,
+        "type_filling": mt5.ORDER_FILLING_IOC,
+    }
+    
+    def build(
+        volume: float,
+        price: float,
+        sl_pips: Optional[float],
+        tp_pips: Optional[float],
+        comment: str,
+        magic: int,
+    ) -> dict:
+        sl, tp = _calculate_sl_tp(direction, price, pip_value, sl_pips, tp_pips)
+        request = template.copy()
+        request["volume"] = volume
+        request["price"] = price
+        request["sl"] = sl
+        request["tp"] = tp
+        request["magic"] = magic
+        request["comment"] = comment
+        return request
+    
+    return build
+
+
+def _order_builder(symbol: str, direction: Literal["BUY", "SELL"]) -> OrderBuilder:
+    """Return the cached builder for (symbol, direction); failures are not cached."""
+    builder = _order_builders.get((symbol, direction))
+    if builder is None:
+        builder = _make_order_builder(symbol, direction)
+        _order_builders[(symbol, direction)] = builder
+    return builder
 
 
 def market_order(
@@ -60,66 +157,81 @@ def market_order(
     Returns:
         TradeResult with execution details
     """
-    # Check symbol
-    symbol_info = mt5.symbol_info(symbol)
-    if symbol_info is None:
-        return TradeResult(False, message=f"Symbol {symbol} not found")
+    normalized_type = order_type.upper()
+    if normalized_type not in _ORDER_TYPES:
+        return TradeResult(False, message=f"Invalid order type: {order_type}")
     
-    if not symbol_info.visible:
-        if not mt5.symbol_select(symbol, True):
-             return TradeResult(False, message=f"Symbol {symbol} not visible and selection failed")
+    # Symbol checks and constants are resolved once per (symbol, direction)
+    try:
+        build_request = _order_builder(symbol, normalized_type)
+    except LookupError as exc:
+        return TradeResult(False, message=str(exc))
     
     tick = mt5.symbol_info_tick(symbol)
     if tick is None:
-        return TradeResult(False, message=f"Failed to get tick for {symbol}")
-        
-    point = symbol_info.point
+        # The symbol may have been deselected since the builder was cached
+        # (e.g. after a reconnect); resolve and select it again once.
+        invalidate(symbol)
+        try:
+            build_request = _order_builder(symbol, normalized_type)
+        except LookupError as exc:
+            return TradeResult(False, message=str(exc))
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None:
+            return TradeResult(False, message=f"Failed to get tick for {symbol}")
     
-    # Determine order type and price
-    normalized_type = order_type.upper()
-    if normalized_type == "BUY":
-        mt5_type = mt5.ORDER_TYPE_BUY
-        price = tick.ask
-    elif normalized_type == "SELL":
-        mt5_type = mt5.ORDER_TYPE_SELL
-        price = tick.bid
-    else:
-        return TradeResult(False, message=f"Invalid order type: {order_type}")
+    price = tick.ask if normalized_type == "BUY" else tick.bid
+    request = build_request(volume, price, sl_pips, tp_pips, comment, magic)
+    
+    result = mt5.order_send(request)
+    
+    if result is None:
+         return TradeResult(False, message="Order send failed (result is None)")
+         
+    if result.retcode != mt5.TRADE_RETCODE_DONE:
+        log.warning(
+            "order failed symbol=%s retcode=%s (%s) comment=%s",
+            symbol, result.retcode, retcode_name(result.retcode), result.comment
+        )
+        return TradeResult(False, message=result.comment, retcode=result.retcode)
+    
+    log.info("order executed symbol=%s price=%s ticket=%s", symbol, result.price, result.order)
+    return TradeResult(True, ticket=result.order, price=result.price, retcode=result.retcode)
 
-    sl, tp = _calculate_sl_tp(normalized_type, price, point, sl_pips, tp_pips)
+def _close_request(pos, tick, comment: str) -> dict:
+    """Build the opposite-side deal that closes ``pos`` at the current tick."""
+    # Reverse the position type to close it
+    # 0 = BUY, 1 = SELL
+    close_type = mt5.ORDER_TYPE_SELL if pos.type == 0 else mt5.ORDER_TYPE_BUY
+    price = tick.bid if pos.type == 0 else tick.ask
     
-    request = {
+    return {
         "action": mt5.TRADE_ACTION_DEAL,
-        "symbol": symbol,
-        "volume": volume,
-        "type": mt5_type,
+        "symbol": pos.symbol,
+        "volume": pos.volume,
+        "type": close_type,
+        "position": pos.ticket,
         "price": price,
-        "sl": sl,
-        "tp": tp,
         "deviation": 20,
-        "magic": magic,
         "comment": comment,
         "type_time": mt5.ORDER_TIME_GTC,
         "type_filling": mt5.ORDER_FILLING_IOC,
     }
-    
-    result = mt5.order_send(request)
-    
+
+def _close_result(result) -> TradeResult:
+    """Translate an ``order_send`` result for a closing deal."""
     if result is None:
-         return TradeResult(False, message="Order send failed (result is None)")
-         
+        return TradeResult(False, message="Order send failed (result is None)")
+    
     if result.retcode != mt5.TRADE_RETCODE_DONE:
-        return TradeResult(
-            False, 
-            message=f"Order failed: {result.comment} (code: {result.retcode})"
+        log.warning(
+            "close failed retcode=%s (%s) comment=%s",
+            result.retcode, retcode_name(result.retcode), result.comment
         )
+        return TradeResult(False, message=result.comment, retcode=result.retcode)
     
-    return TradeResult(
-        True,
-        ticket=result.order,
-        price=result.price,
-        message=f"Order executed at {result.price}"
-    )
+    log.info("position closed price=%s", result.price)
+    return TradeResult(True, price=result.price, retcode=result.retcode)
 
 def close_position(ticket: int, comment: str = "") -> TradeResult:
     """Close a position by ticket number."""
@@ -130,42 +242,78 @@ def close_position(ticket: int, comment: str = "") -> TradeResult:
     
     pos = positions[0]
     
-    # Reverse the position type to close it
-    # 0 = BUY, 1 = SELL
-    close_type = mt5.ORDER_TYPE_SELL if pos.type == 0 else mt5.ORDER_TYPE_BUY
-    
     # Get current price
     tick = mt5.symbol_info_tick(pos.symbol)
     if tick is None:
         return TradeResult(False, message=f"Tick not available for {pos.symbol}")
-        
-    price = tick.bid if pos.type == 0 else tick.ask
     
-    request = {
-        "action": mt5.TRADE_ACTION_DEAL,
-        "symbol": pos.symbol,
-        "volume": pos.volume,
-        "type": close_type,
-        "position": ticket,
-        "price": price,
-        "deviation": 20,
-        "comment": comment,
-        "type_time": mt5.ORDER_TIME_GTC,
-        "type_filling": mt5.ORDER_FILLING_IOC,
-    }
+    return _close_result(mt5.order_send(_close_request(pos, tick, comment)))
+
+def close_positions_bulk(tickets: Iterable[int], comment: str = "") -> List[TradeResult]:
+    """
+    Close several positions with one position snapshot.
     
-    result = mt5.order_send(request)
+    Positions are read with a single ``positions_get()`` call and each
+    distinct symbol's tick is fetched once. Closing orders are sent one after
+    another on the calling thread, since the MT5 API must not be called
+    concurrently. Duplicate tickets are closed only once.
     
-    if result is None:
-        return TradeResult(False, message="Order send failed (result is None)")
+    Args:
+        tickets: Position tickets to close
+        comment: Order comment
     
-    if result.retcode != mt5.TRADE_RETCODE_DONE:
-        return TradeResult(False, message=f"Close failed: {result.comment}")
+    Returns:
+        One TradeResult per input ticket, in input order
+    """
+    tickets = list(tickets)
+    positions = mt5.positions_get()
+    by_ticket = {pos.ticket: pos for pos in positions} if positions else {}
+    
+    results: Dict[int, TradeResult] = {}
+    ticks = {}
     
-    return TradeResult(True, price=result.price, message="Position closed")
+    for ticket in dict.fromkeys(tickets):
+        pos = by_ticket.get(ticket)
+        if pos is None:
+            results[ticket] = TradeResult(False, message=f"Position {ticket} not found")
+            continue
+        
+        if pos.symbol not in ticks:
+            ticks[pos.symbol] = mt5.symbol_info_tick(pos.symbol)
+        tick = ticks[pos.symbol]
+        if tick is None:
+            results[ticket] = TradeResult(False, message=f"Tick not available for {pos.symbol}")
+            continue
+        
+        results[ticket] = _close_result(mt5.order_send(_close_request(pos, tick, comment)))
+    
+    return [results[ticket] for ticket in tickets]
+
+async def market_order_async(
+    symbol: str,
+    order_type: Literal["BUY", "SELL"],
+    volume: float,
+    sl_pips: Optional[float] = None,
+    tp_pips: Optional[float] = None,
+    comment: str = "",
+    magic: int = 0
+) -> TradeResult:
+    """Awaitable :func:`market_order`, executed on the MT5 worker thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _mt5_pool,
+        functools.partial(market_order, symbol, order_type, volume, sl_pips, tp_pips, comment, magic),
+    )
+
+async def close_position_async(ticket: int, comment: str = "") -> TradeResult:
+    """Awaitable :func:`close_position`, executed on the MT5 worker thread."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_mt5_pool, close_position, ticket, comment)
 
 # Usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     if mt5.initialize():
         print("MT5 Initialized")
         
@@ -1,3 +1,3 @@
-from .open_positions import get_open_positions_summary
+from .open_positions import POSITION_DTYPE, get_open_positions_summary, positions_to_dataframe
 
-__all__ = ["get_open_positions_summary"]
+__all__ = ["POSITION_DTYPE", "get_open_positions_summary", "positions_to_dataframe"]
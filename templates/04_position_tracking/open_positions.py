@@ -1,47 +1,70 @@
 import MetaTrader5 as mt5
-from typing import Dict, List, Any
+import numpy as np
+import pandas as pd
 
+# One row per open position. ``type`` keeps the raw MT5 position type
+# (POSITION_TYPE_BUY / POSITION_TYPE_SELL); see :func:`positions_to_dataframe`.
+POSITION_DTYPE = np.dtype(
+    [
+        ("ticket", "i8"),
+        ("symbol", "U32"),
+        ("type", "u1"),
+        ("volume", "f8"),
+        ("open_price", "f8"),
+        ("current_price", "f8"),
+        ("profit", "f8"),
+        ("swap", "f8"),
+        ("comment", "U32"),
+    ]
+)
 
-def get_open_positions_summary(symbol: str | None = None) -> List[Dict[str, Any]]:
+_TYPE_NAMES = np.array(["BUY", "SELL"])
+
+
+def get_open_positions_summary(symbol: str | None = None) -> np.ndarray:
     """Return normalized summary for open MT5 positions.
 
     Args:
         symbol: Optional symbol filter (e.g. "EURUSD").
 
     Returns:
-        A list of dicts with key fields for monitoring positions.
+        A structured array with ``POSITION_DTYPE`` rows, one per position.
     """
     positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
     if positions is None:
-        return []
-
-    summary: List[Dict[str, Any]] = []
-    for pos in positions:
-        summary.append(
-            {
-                "ticket": pos.ticket,
-                "symbol": pos.symbol,
-                "type": "BUY" if pos.type == mt5.POSITION_TYPE_BUY else "SELL",
-                "volume": pos.volume,
-                "open_price": pos.price_open,
-                "current_price": pos.price_current,
-                "profit": pos.profit,
-                "swap": pos.swap,
-                "comment": pos.comment,
-            }
+        return np.empty(0, dtype=POSITION_DTYPE)
+
+    summary = np.empty(len(positions), dtype=POSITION_DTYPE)
+    for i, pos in enumerate(positions):
+        summary[i] = (
+            pos.ticket,
+            pos.symbol,
+            pos.type,
+            pos.volume,
+            pos.price_open,
+            pos.price_current,
+            pos.profit,
+            pos.swap,
+            pos.comment,
         )
 
     return summary
 
 
+def positions_to_dataframe(summary: np.ndarray) -> pd.DataFrame:
+    """Convert a summary array to a DataFrame with ``type`` as "BUY"/"SELL"."""
+    frame = pd.DataFrame(summary)
+    frame["type"] = _TYPE_NAMES[summary["type"]]
+    return frame
+
+
 if __name__ == "__main__":
     if not mt5.initialize():
         print("MT5 initialization failed")
     else:
         rows = get_open_positions_summary()
-        if not rows:
+        if len(rows) == 0:
             print("No open positions")
         else:
-            for row in rows:
-                print(row)
+            print(positions_to_dataframe(rows))
         mt5.shutdown()
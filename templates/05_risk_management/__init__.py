@@ -1,3 +1,3 @@
-from .position_sizer import calculate_lot_size
+from .position_sizer import calculate_lot_size, calculate_lot_sizes, invalidate
 
-__all__ = ["calculate_lot_size"]
+__all__ = ["calculate_lot_size", "calculate_lot_sizes", "invalidate"]
@@ -1,18 +1,127 @@
 """Position sizing helpers for MT5 risk-based lot calculation."""
 
-from typing import Optional
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 
 import MetaTrader5 as mt5
 
+# (tick_value, tick_size, point, volume_step, min_ticks, max_ticks)
+# min/max volume are stored as whole multiples of volume_step.
+SymbolParams = Tuple[float, float, float, float, int, int]
 
-def _normalize_lot_size(raw_lot: float, min_lot: float, max_lot: float, lot_step: float) -> float:
-    """Normalize lot size to broker constraints."""
+# Absorbs float noise in volume / step (e.g. 0.3 / 0.1 == 2.9999999999999996)
+_STEP_EPSILON = 1e-9
+
+SYMBOL_CACHE_TTL = 5.0
+BALANCE_CACHE_TTL = 1.0
+
+# symbol -> (monotonic expiry, params)
+_symbol_cache: Dict[str, Tuple[float, SymbolParams]] = {}
+# (monotonic expiry, balance)
+_balance_cache: Tuple[float, float] = (0.0, 0.0)
+
+
+def invalidate(symbol: Optional[str] = None) -> None:
+    """Drop cached MT5 values.
+
+    Call after a reconnect or account switch. Without ``symbol`` every cached
+    symbol and the account balance are purged.
+    """
+    global _balance_cache
+
+    if symbol is None:
+        _symbol_cache.clear()
+        _balance_cache = (0.0, 0.0)
+    else:
+        _symbol_cache.pop(symbol, None)
+
+
+def _symbol_params(symbol: str) -> Optional[SymbolParams]:
+    """Return sizing constants for ``symbol``, refreshed at most every ``SYMBOL_CACHE_TTL`` s."""
+    now = time.monotonic()
+    cached = _symbol_cache.get(symbol)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    symbol_info = mt5.symbol_info(symbol)
+    if symbol_info is None:
+        return None
+
+    lot_step = symbol_info.volume_step
+    if lot_step > 0:
+        # Off-grid limits are rounded inwards so clamped lots stay within them
+        min_ticks = math.ceil(symbol_info.volume_min / lot_step - _STEP_EPSILON)
+        max_ticks = math.floor(symbol_info.volume_max / lot_step + _STEP_EPSILON)
+    else:
+        min_ticks = max_ticks = 0
+
+    params = (
+        symbol_info.trade_tick_value,
+        symbol_info.trade_tick_size,
+        symbol_info.point,
+        lot_step,
+        min_ticks,
+        max_ticks,
+    )
+    _symbol_cache[symbol] = (now + SYMBOL_CACHE_TTL, params)
+    return params
+
+
+def _account_balance() -> Optional[float]:
+    """Return account balance, refreshed at most every ``BALANCE_CACHE_TTL`` s."""
+    global _balance_cache
+
+    now = time.monotonic()
+    if _balance_cache[0] > now:
+        return _balance_cache[1]
+
+    account_info = mt5.account_info()
+    if account_info is None:
+        return None
+
+    _balance_cache = (now + BALANCE_CACHE_TTL, account_info.balance)
+    return account_info.balance
+
+
+def _normalize_lot_size(raw_lot: float, lot_step: float, min_ticks: int, max_ticks: int) -> float:
+    """Normalize lot size to broker constraints.
+
+    Clamping is done on whole lot-step counts, so values never drift off the
+    broker's step grid.
+    """
     if lot_step <= 0:
         return 0.0
 
-    normalized = round(raw_lot / lot_step) * lot_step
-    normalized = max(min_lot, min(normalized, max_lot))
-    return round(normalized, 2)
+    ticks = min(max(int(round(raw_lot / lot_step)), min_ticks), max_ticks)
+    return round(ticks * lot_step, 2)
+
+
+def _lot_size(params: SymbolParams, account_balance: float, risk_percent: float, sl_pips: float) -> float:
+    """Size a position from already-resolved symbol constants."""
+    if risk_percent <= 0 or sl_pips <= 0:
+        return 0.0
+
+    tick_value, tick_size, point, lot_step, min_ticks, max_ticks = params
+
+    if tick_size <= 0 or point <= 0:
+        return 0.0
+
+    # tick_value is profit/loss change per tick movement for 1 lot.
+    pip_value = (tick_value / tick_size) * point * 10
+    if pip_value <= 0:
+        return 0.0
+
+    risk_amount = account_balance * (risk_percent / 100)
+    raw_lot = risk_amount / (sl_pips * pip_value)
+
+    return _normalize_lot_size(
+        raw_lot=raw_lot,
+        lot_step=lot_step,
+        min_ticks=min_ticks,
+        max_ticks=max_ticks,
+    )
 
 
 def calculate_lot_size(
@@ -23,6 +132,10 @@ def calculate_lot_size(
 ) -> float:
     """Calculate lot size from account risk percentage.
 
+    Symbol constants and the account balance are served from a short-lived
+    cache (see :func:`invalidate`), so sizing many candidates back-to-back
+    costs no extra MT5 round-trips.
+
     Args:
         symbol: Trading symbol (e.g. "EURUSD").
         risk_percent: Risk per trade in percent (1.0 means 1%).
@@ -36,36 +149,57 @@ def calculate_lot_size(
         return 0.0
 
     if account_balance is None:
-        account_info = mt5.account_info()
-        if account_info is None:
+        account_balance = _account_balance()
+        if account_balance is None:
             return 0.0
-        account_balance = account_info.balance
 
-    symbol_info = mt5.symbol_info(symbol)
-    if symbol_info is None:
+    params = _symbol_params(symbol)
+    if params is None:
         return 0.0
 
-    tick_value = symbol_info.trade_tick_value
-    tick_size = symbol_info.trade_tick_size
-    point = symbol_info.point
+    return _lot_size(params, account_balance, risk_percent, sl_pips)
 
-    if tick_size <= 0 or point <= 0:
-        return 0.0
 
-    # tick_value is profit/loss change per tick movement for 1 lot.
-    pip_value = (tick_value / tick_size) * point * 10
-    if pip_value <= 0:
-        return 0.0
+def calculate_lot_sizes(
+    requests: List[Tuple[str, float, float]],
+    account_balance: Optional[float] = None,
+    max_workers: int = 1,
+) -> List[float]:
+    """Calculate lot sizes for many ``(symbol, risk_percent, sl_pips)`` requests.
 
-    risk_amount = account_balance * (risk_percent / 100)
-    raw_lot = risk_amount / (sl_pips * pip_value)
+    The account balance is read once and every distinct symbol is resolved
+    once. Lookups are serialized by default because the MT5 Python API is
+    not safe to call concurrently; raise ``max_workers`` only if you have
+    verified your terminal tolerates it.
 
-    return _normalize_lot_size(
-        raw_lot=raw_lot,
-        min_lot=symbol_info.volume_min,
-        max_lot=symbol_info.volume_max,
-        lot_step=symbol_info.volume_step,
-    )
+    Args:
+        requests: ``(symbol, risk_percent, sl_pips)`` tuples.
+        account_balance: Optional account balance override.
+        max_workers: Maximum concurrent MT5 symbol lookups (default 1, serialized).
+
+    Returns:
+        Lot sizes in the same order as ``requests`` (0.0 where unavailable).
+    """
+    if account_balance is None:
+        account_balance = _account_balance()
+        if account_balance is None:
+            return [0.0] * len(requests)
+
+    symbols = list(dict.fromkeys(symbol for symbol, _, _ in requests))
+    params: Dict[str, Optional[SymbolParams]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_symbol_params, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            params[futures[future]] = future.result()
+
+    lots: List[float] = []
+    for symbol, risk_percent, sl_pips in requests:
+        symbol_params = params[symbol]
+        if symbol_params is None:
+            lots.append(0.0)
+        else:
+            lots.append(_lot_size(symbol_params, account_balance, risk_percent, sl_pips))
+    return lots
 
 
 if __name__ == "__main__":
@@ -6,11 +6,23 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Callable
 
 import MetaTrader5 as mt5
-import pandas as pd
+import numpy as np
+
+log = logging.getLogger("mt5.strategy")
+
+# The MT5 API is not safe to call concurrently: route every call through one
+# long-lived worker thread so the event loop never blocks on terminal IPC.
+_mt5_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mt5")
 
 
 @dataclass
@@ -19,6 +31,54 @@ class CrossoverSignal:
     price: float
 
 
+_SIGNAL_DTYPE = np.dtype([("action", "u1"), ("price", "f8"), ("ts", "i8")])
+_ACTIONS = ("HOLD", "BUY", "SELL")
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+
+
+class SignalRing:
+    """Single-producer/single-consumer ring buffer of crossover signals.
+
+    Only the producer advances ``head`` and only the consumer advances
+    ``tail``, so neither side takes a lock; the event is used purely to wake
+    an idle consumer. ``capacity`` must be a power of two.
+    """
+
+    def __init__(self, capacity: int = 64) -> None:
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        self._slots = np.zeros(capacity, dtype=_SIGNAL_DTYPE)
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = 0
+        self._ready = threading.Event()
+
+    def put(self, signal: CrossoverSignal) -> bool:
+        """Publish a signal; returns False if the consumer is a full ring behind."""
+        head = self._head
+        if head - self._tail > self._mask:
+            return False
+        self._slots[head & self._mask] = (_ACTION_CODES[signal.action], signal.price, time.time_ns())
+        self._head = head + 1
+        self._ready.set()
+        return True
+
+    def get(self, timeout: float | None = None) -> tuple[CrossoverSignal, int] | None:
+        """Take the oldest ``(signal, published_ns)``, waiting up to ``timeout``."""
+        while self._tail == self._head:
+            self._ready.clear()
+            # Re-check after clearing so a put() racing the clear is not missed.
+            if self._tail != self._head:
+                break
+            if not self._ready.wait(timeout):
+                return None
+
+        slot = self._slots[self._tail & self._mask]
+        item = (CrossoverSignal(_ACTIONS[slot["action"]], float(slot["price"])), int(slot["ts"]))
+        self._tail += 1
+        return item
+
+
 class SMACrossoverBot:
     def __init__(
         self,
@@ -26,48 +86,157 @@ class SMACrossoverBot:
         timeframe: int = mt5.TIMEFRAME_M15,
         fast_period: int = 10,
         slow_period: int = 30,
+        order_handler: Callable[[CrossoverSignal], object] | None = None,
     ) -> None:
         self.symbol = symbol
         self.timeframe = timeframe
         self.fast_period = fast_period
         self.slow_period = slow_period
+        # Called with each BUY/SELL signal, e.g. to place an order.
+        self.order_handler = order_handler
 
-    def get_signal(self) -> CrossoverSignal:
-        bars = max(self.fast_period, self.slow_period) + 5
-        rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, bars)
-        if rates is None or len(rates) < bars:
-            return CrossoverSignal("HOLD", 0.0)
+        # Hands signals from the polling loop to the submitter thread.
+        self._signals = SignalRing()
 
-        frame = pd.DataFrame(rates)
-        frame["fast"] = frame["close"].rolling(self.fast_period).mean()
-        frame["slow"] = frame["close"].rolling(self.slow_period).mean()
+        # Rolling state over closed bars, updated in O(1) per new bar.
+        self._window = max(fast_period, slow_period)
+        self._closes: deque[float] = deque(maxlen=self._window)
+        self._fast_sum = 0.0
+        self._slow_sum = 0.0
+        self._last_fast = 0.0
+        self._last_slow = 0.0
+        self._last_time = 0
 
-        prev_fast = frame["fast"].iloc[-2]
-        prev_slow = frame["slow"].iloc[-2]
-        curr_fast = frame["fast"].iloc[-1]
-        curr_slow = frame["slow"].iloc[-1]
-        price = float(frame["close"].iloc[-1])
+    def _prime(self, rates) -> tuple[float, float]:
+        """Rebuild the rolling state from ``self._window + 1`` closed bars.
 
+        Returns the (fast, slow) SMAs of the bar before the newest one.
+        """
+        closes = rates["close"]  # field view, no copy
+        csum = np.empty(len(closes) + 1)
+        csum[0] = 0.0
+        np.cumsum(closes, out=csum[1:])
+        fast = (csum[self.fast_period:] - csum[:-self.fast_period]) / self.fast_period
+        slow = (csum[self.slow_period:] - csum[:-self.slow_period]) / self.slow_period
+
+        self._closes = deque(closes[-self._window:].tolist(), maxlen=self._window)
+        self._fast_sum = float(csum[-1] - csum[-1 - self.fast_period])
+        self._slow_sum = float(csum[-1] - csum[-1 - self.slow_period])
+        self._last_fast = float(fast[-1])
+        self._last_slow = float(slow[-1])
+        self._last_time = int(rates["time"][-1])
+        return float(fast[-2]), float(slow[-2])
+
+    def _push(self, close: float, bar_time: int) -> None:
+        """Slide both windows forward by one closed bar."""
+        closes = self._closes
+        self._fast_sum += close - closes[-self.fast_period]
+        self._slow_sum += close - closes[-self.slow_period]
+        closes.append(close)
+        self._last_fast = self._fast_sum / self.fast_period
+        self._last_slow = self._slow_sum / self.slow_period
+        self._last_time = bar_time
+
+    def _crossover(self, prev_fast: float, prev_slow: float, price: float) -> CrossoverSignal:
+        curr_fast = self._last_fast
+        curr_slow = self._last_slow
         if prev_fast <= prev_slow and curr_fast > curr_slow:
             return CrossoverSignal("BUY", price)
         if prev_fast >= prev_slow and curr_fast < curr_slow:
             return CrossoverSignal("SELL", price)
         return CrossoverSignal("HOLD", price)
 
-    def run(self, poll_seconds: int = 60) -> None:
-        print(f"Running SMA crossover on {self.symbol}")
+    def get_signal(self) -> CrossoverSignal:
+        """Evaluate the crossover on the newest closed bar.
+
+        The first call (or any call after a missed bar) loads the full
+        window; afterwards only the last two closed bars are requested.
+        """
+        if self._closes:
+            rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 1, 2)
+            if rates is None or len(rates) < 2:
+                return CrossoverSignal("HOLD", 0.0)
+            price = float(rates["close"][-1])
+            if int(rates["time"][-1]) == self._last_time:
+                return CrossoverSignal("HOLD", price)
+            if int(rates["time"][-2]) == self._last_time:
+                prev_fast = self._last_fast
+                prev_slow = self._last_slow
+                self._push(price, int(rates["time"][-1]))
+                return self._crossover(prev_fast, prev_slow, price)
+            # A bar was skipped since the last poll; rebuild the window.
+
+        bars = self._window + 1
+        rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 1, bars)
+        if rates is None or len(rates) < bars:
+            return CrossoverSignal("HOLD", 0.0)
+        prev_fast, prev_slow = self._prime(rates)
+        return self._crossover(prev_fast, prev_slow, float(rates["close"][-1]))
+
+    async def _keepalive(self, interval: float = 10.0) -> None:
+        """Touch the terminal periodically so the IPC pipe stays warm."""
+        loop = asyncio.get_running_loop()
         while True:
-            signal = self.get_signal()
-            if signal.action != "HOLD":
-                print(f"Signal={signal.action} price={signal.price:.5f}")
-            time.sleep(poll_seconds)
+            await loop.run_in_executor(_mt5_pool, mt5.terminal_info)
+            await asyncio.sleep(interval)
+
+    def _submit_loop(self, stop: threading.Event) -> None:
+        """Consumer side of the signal ring; owns order submission."""
+        while not stop.is_set():
+            item = self._signals.get(timeout=0.5)
+            if item is None:
+                continue
+            signal, published_ns = item
+            log.info(
+                "signal=%s price=%.5f queued_us=%d",
+                signal.action,
+                signal.price,
+                (time.time_ns() - published_ns) // 1000,
+            )
+            if self.order_handler is not None:
+                # MT5 calls still go through the single MT5 worker thread.
+                try:
+                    result = _mt5_pool.submit(self.order_handler, signal).result()
+                except Exception:
+                    log.exception("order handler failed for %s", signal.action)
+                    continue
+                # Handlers such as market_order report failure via TradeResult
+                if getattr(result, "success", True) is False:
+                    log.warning(
+                        "order handler rejected signal=%s retcode=%s message=%s",
+                        signal.action,
+                        getattr(result, "retcode", None),
+                        getattr(result, "message", ""),
+                    )
+
+    async def run(self, poll_seconds: int = 60) -> None:
+        log.info("Running SMA crossover on %s", self.symbol)
+        loop = asyncio.get_running_loop()
+        keepalive = asyncio.create_task(self._keepalive())
+        stop = threading.Event()
+        submitter = threading.Thread(
+            target=self._submit_loop, args=(stop,), name="sma-submitter", daemon=True
+        )
+        submitter.start()
+        try:
+            while True:
+                signal = await loop.run_in_executor(_mt5_pool, self.get_signal)
+                if signal.action != "HOLD" and not self._signals.put(signal):
+                    log.warning("signal ring full, dropping %s", signal.action)
+                await asyncio.sleep(poll_seconds)
+        finally:
+            keepalive.cancel()
+            stop.set()
+            # Wait off the loop thread: the submitter may be mid-order
+            await loop.run_in_executor(None, submitter.join)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     if not mt5.initialize():
         print(f"MT5 init failed: {mt5.last_error()}")
     else:
         try:
-            SMACrossoverBot().run()
+            asyncio.run(SMACrossoverBot().run())
         finally:
             mt5.shutdown()
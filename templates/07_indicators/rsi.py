@@ -2,46 +2,169 @@
 
 from __future__ import annotations
 
+import math
+
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; calculate_rsi falls back to pandas.
+    njit = None
+
+
+def _rsi_loop(close: np.ndarray, period: int) -> np.ndarray:
+    """Single-pass Wilder RSI over a float64 close array (compiled with numba)."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    # Seed with the simple mean of the first ``period`` deltas; non-finite
+    # deltas (NaN/inf prices) are skipped here and below.
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        d = close[i] - close[i - 1]
+        if math.isfinite(d):
+            avg_gain += max(d, 0.0)
+            avg_loss += max(-d, 0.0)
+    avg_gain /= period
+    avg_loss /= period
+
+    # Flat or no-loss windows should evaluate to 100.
+    out[period] = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    alpha = 1.0 / period
+    for i in range(period + 1, n):
+        d = close[i] - close[i - 1]
+        if math.isfinite(d):
+            avg_gain = avg_gain * (1.0 - alpha) + max(d, 0.0) * alpha
+            avg_loss = avg_loss * (1.0 - alpha) + max(-d, 0.0) * alpha
+        out[i] = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return out
+
+
+_rsi_core = njit(cache=True)(_rsi_loop) if njit is not None else None
+
+
+def _rsi_vectorized(close: np.ndarray, period: int) -> np.ndarray:
+    """Same result as :func:`_rsi_loop`, using pandas' C ``ewm`` instead of numba."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    if n <= period:
+        return out
+
+    delta = np.diff(close)
+    delta[~np.isfinite(delta)] = np.nan
+    gain = np.clip(delta, 0, None)
+    loss = np.clip(-delta, 0, None)
+
+    # delta[period - 1] lines up with close[period]; replace it with the
+    # Wilder seed and let ewm(adjust=False) run the recurrence from there.
+    # ignore_na=True leaves the averages untouched on skipped deltas.
+    gain[period - 1] = np.nansum(gain[:period]) / period
+    loss[period - 1] = np.nansum(loss[:period]) / period
+    ewm = dict(alpha=1 / period, adjust=False, ignore_na=True)
+    avg_gain = pd.Series(gain[period - 1:]).ewm(**ewm).mean().to_numpy()
+    avg_loss = pd.Series(loss[period - 1:]).ewm(**ewm).mean().to_numpy()
+
+    out[period:] = _rsi_from_averages(avg_gain, avg_loss)
+    return out
+
 
 def calculate_rsi(close: pd.Series, period: int = 14) -> pd.Series:
     """Calculate Relative Strength Index (RSI).
 
+    Uses a compiled single-pass kernel when numba is installed and a
+    vectorized pandas path otherwise.
+
+    Args:
+        close: Close price series. Non-finite prices are skipped: the
+            price changes touching them do not update the averages.
+        period: RSI lookback period.
+
+    Returns:
+        RSI series in range [0, 100]. The first ``period`` values are NaN
+        (Wilder's smoothing is seeded with the mean of the first ``period``
+        price changes).
+    """
+    if period <= 0:
+        raise ValueError("period must be positive")
+
+    values = close.to_numpy(dtype=np.float64)
+    if _rsi_core is not None:
+        result = _rsi_core(values, period)
+    else:
+        result = _rsi_vectorized(values, period)
+    return pd.Series(result, index=close.index, name=close.name)
+
+
+def calculate_rsi_batch(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """Calculate RSI for many symbols in one vectorized pass.
+
+    Wilder smoothing runs as a loop over time, with each step applied to all
+    symbols at once. Results match :func:`calculate_rsi` row by row,
+    including how non-finite prices are skipped.
+
     Args:
-        close: Close price series.
+        closes: 2-D array of close prices, shape ``(n_symbols, n_bars)``.
         period: RSI lookback period.
 
     Returns:
-        RSI series in range [0, 100].
+        RSI array with the same shape as ``closes``.
     """
     if period <= 0:
         raise ValueError("period must be positive")
 
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim != 2:
+        raise ValueError("closes must be a 2-D array of shape (n_symbols, n_bars)")
+
+    n_bars = closes.shape[1]
+    # Time-major layout so each step reads and writes one contiguous row.
+    out = np.full((n_bars, closes.shape[0]), np.nan)
+    if n_bars <= period:
+        return out.T
+
+    delta = np.diff(closes, axis=1).T
+    finite = np.isfinite(delta)
+    gain = np.clip(delta, 0, None)
+    loss = np.clip(-delta, 0, None)
+
+    # Seed with the simple mean of the first ``period`` deltas.
+    avg_gain = np.where(finite[:period], gain[:period], 0.0).sum(axis=0) / period
+    avg_loss = np.where(finite[:period], loss[:period], 0.0).sum(axis=0) / period
+    out[period] = _rsi_from_averages(avg_gain, avg_loss)
+
+    for t in range(period, n_bars - 1):
+        avg_gain = np.where(finite[t], (avg_gain * (period - 1) + gain[t]) / period, avg_gain)
+        avg_loss = np.where(finite[t], (avg_loss * (period - 1) + loss[t]) / period, avg_loss)
+        out[t + 1] = _rsi_from_averages(avg_gain, avg_loss)
 
-    avg_gain = gain.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
-    avg_loss = loss.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    return out.T
 
-    rs = avg_gain / avg_loss.replace(0, pd.NA)
-    rsi = 100 - (100 / (1 + rs))
 
+def _rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
     # Flat or no-loss windows should evaluate to 100.
-    return rsi.fillna(100)
+    return np.where(avg_loss == 0.0, 100.0, rsi)
 
 
-def add_rsi_column(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
-    """Return a copy of OHLCV DataFrame with an ``rsi`` column.
+def add_rsi_column(df: pd.DataFrame, period: int = 14, inplace: bool = False) -> pd.DataFrame:
+    """Add an ``rsi`` column to an OHLCV DataFrame.
 
-    Expects a ``close`` column in the input DataFrame.
+    Expects a ``close`` column in the input DataFrame. By default a shallow
+    copy is returned (existing columns are shared, ``df`` is left untouched);
+    with ``inplace=True`` the column is added to ``df`` itself.
     """
     if "close" not in df.columns:
         raise KeyError("DataFrame must contain a 'close' column")
 
-    result = df.copy()
-    result["rsi"] = calculate_rsi(result["close"], period=period)
+    result = df if inplace else df.copy(deep=False)
+    result["rsi"] = calculate_rsi(df["close"], period=period)
     return result
 
 